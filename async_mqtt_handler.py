@@ -0,0 +1,164 @@
+"""
+Asyncio variant of the MQTT alert handler, built on aiomqtt.
+
+The blocking handler in mqtt_handler.py decodes and dispatches on paho's
+network thread, so a storm of events serializes behind one callback. Here
+the receive loop only enqueues raw payloads; a pool of worker tasks
+decodes and publishes concurrently, so socket reads, JSON parsing and
+socket writes overlap. A semaphore bounds in-flight publishes to keep the
+socket full without unbounded queueing.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Callable, Optional, Union
+
+import aiomqtt
+import msgspec
+import zstandard
+from pydantic import ValidationError
+
+from models import EmergencyEvent, EmergencyEventStruct, Alert
+from mqtt_handler import (
+    _COMPRESS_THRESHOLD,
+    _alert_from_event, _encode_alert, _encode_alert_msgpack,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMQTTAlertHandler:
+    """
+    Async counterpart of MQTTAlertHandler.
+    - Subscribes to emergency events from the stadium simulator (via simulator broker)
+    - Publishes alerts to clients (via client broker)
+    - Decodes and dispatches on a bounded worker pool instead of the network loop
+    """
+
+    def __init__(self,
+                 simulator_broker: str, simulator_port: int,
+                 client_broker: str, client_port: int,
+                 simulator_topic: str = "stadium/events/alerts",
+                 client_topic_prefix: str = "alerts/client",
+                 workers: int = 4, max_inflight: int = 64,
+                 wire_format: str = "json"):
+        self.simulator_broker = simulator_broker
+        self.simulator_port = simulator_port
+        self.simulator_topic = simulator_topic
+
+        self.client_broker = client_broker
+        self.client_port = client_port
+        self.client_topic_prefix = client_topic_prefix
+
+        if wire_format not in ("json", "msgpack"):
+            raise ValueError(f"Unsupported wire format: {wire_format}")
+        self.wire_format = wire_format
+        self._encode = _encode_alert_msgpack if wire_format == "msgpack" else _encode_alert
+        self._topic_suffix = ".mp" if wire_format == "msgpack" else ""
+        self.broadcast_topic = "alerts/broadcast" + self._topic_suffix
+
+        self._id_gen = itertools.count(1)
+        self.message_callback: Optional[Callable] = None
+
+        self._workers = workers
+        self._inbox: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._publish_sem = asyncio.Semaphore(max_inflight)
+        self._event_decoder = msgspec.json.Decoder(EmergencyEventStruct)
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._topic_cache: dict = {}
+        self._publisher: Optional[aiomqtt.Client] = None
+
+    def set_message_callback(self, callback: Callable):
+        """Set a callback (sync or async) to process incoming emergency events."""
+        self.message_callback = callback
+
+    async def run(self):
+        """Connect to both brokers and process events until cancelled."""
+        async with aiomqtt.Client(self.client_broker, self.client_port) as publisher:
+            self._publisher = publisher
+            logger.info("[CLIENT] Connected to broker at %s:%s",
+                        self.client_broker, self.client_port)
+            async with aiomqtt.Client(self.simulator_broker, self.simulator_port) as subscriber:
+                logger.info("[SIMULATOR] Connected to broker at %s:%s",
+                            self.simulator_broker, self.simulator_port)
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(self._workers):
+                        tg.create_task(self._worker())
+                    tg.create_task(self._receive(subscriber))
+
+    async def _receive(self, subscriber: aiomqtt.Client):
+        """Receive loop: enqueue raw payloads and nothing else."""
+        async with subscriber.messages() as messages:
+            await subscriber.subscribe(self.simulator_topic)
+            logger.info("[SIMULATOR] Subscribed to topic: %s", self.simulator_topic)
+            async for message in messages:
+                await self._inbox.put(message.payload)
+
+    async def _worker(self):
+        """Worker loop: decode queued payloads and dispatch alerts."""
+        while True:
+            raw = await self._inbox.get()
+            try:
+                await self._handle_payload(raw)
+            except (msgspec.DecodeError, ValidationError) as e:
+                logger.error("Failed to decode JSON: %s", e)
+            except Exception as e:
+                logger.error("Error processing message: %s", e)
+            finally:
+                self._inbox.task_done()
+
+    async def _handle_payload(self, raw: bytes):
+        try:
+            event = self._event_decoder.decode(raw)
+        except msgspec.ValidationError:
+            # Same coercion fallback as the blocking handler
+            event = EmergencyEvent.model_validate_json(raw)
+        logger.debug("[SIMULATOR] Received emergency event: %s", event.event_type)
+
+        if self.message_callback:
+            result = self.message_callback(event)
+            if asyncio.iscoroutine(result):
+                await result
+        else:
+            alert = self._create_alert_from_event(event)
+            await self.broadcast_alert(alert)
+
+    def _create_alert_from_event(self, event: Union[EmergencyEvent, EmergencyEventStruct]) -> Alert:
+        """Convert an emergency event to an alert."""
+        return _alert_from_event(next(self._id_gen), event)
+
+    def _serialize_alert(self, alert: Alert) -> bytes:
+        """Serialize an alert to its client payload."""
+        return self._encode(alert)
+
+    def _maybe_compress(self, topic: str, payload: bytes) -> tuple:
+        """Compress payloads above the size threshold, marking the topic."""
+        if len(payload) > _COMPRESS_THRESHOLD:
+            return topic + ".zstd", self._compressor.compress(payload)
+        return topic, payload
+
+    async def broadcast_alert(self, alert: Alert):
+        """Send alert to all clients via broadcast topic."""
+        await self._publish(*self._maybe_compress(
+            self.broadcast_topic, self._serialize_alert(alert)
+        ))
+
+    def _client_topic(self, client_id: str) -> str:
+        """Topic for a specific client, built once per client id."""
+        topic = self._topic_cache.get(client_id)
+        if topic is None:
+            topic = self._topic_cache.setdefault(
+                client_id, f"{self.client_topic_prefix}/{client_id}{self._topic_suffix}"
+            )
+        return topic
+
+    async def send_alert_to_client(self, client_id: str, alert: Alert):
+        """Send alert to a specific client."""
+        await self._publish(*self._maybe_compress(
+            self._client_topic(client_id), self._serialize_alert(alert)
+        ))
+
+    async def _publish(self, topic: str, payload: bytes):
+        async with self._publish_sem:
+            await self._publisher.publish(topic, payload, qos=1)
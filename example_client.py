@@ -4,8 +4,12 @@ This demonstrates how clients should connect to receive emergency alerts.
 """
 
 import paho.mqtt.client as mqtt
-import json
+import orjson
 import sys
+import msgspec
+import zstandard
+
+_decompressor = zstandard.ZstdDecompressor()
 
 
 def on_connect(client, userdata, flags, rc):
@@ -13,15 +17,19 @@ def on_connect(client, userdata, flags, rc):
     if rc == 0:
         print("✓ Connected to MQTT broker")
         
-        # Subscribe to broadcast alerts (all clients receive these)
-        client.subscribe("alerts/broadcast")
-        print("✓ Subscribed to: alerts/broadcast")
-        
+        # Subscribe to broadcast alerts (all clients receive these);
+        # large alerts arrive compressed on the .zstd variants and
+        # msgpack-encoded alerts on the .mp variants
+        for suffix in ("", ".zstd", ".mp", ".mp.zstd"):
+            client.subscribe(f"alerts/broadcast{suffix}")
+        print("✓ Subscribed to: alerts/broadcast (+ .zstd/.mp variants)")
+
         # Optionally subscribe to client-specific topic
         # Replace 'client_123' with your actual client ID
         client_id = userdata.get('client_id', 'client_123')
-        client.subscribe(f"alerts/client/{client_id}")
-        print(f"✓ Subscribed to: alerts/client/{client_id}")
+        for suffix in ("", ".zstd", ".mp", ".mp.zstd"):
+            client.subscribe(f"alerts/client/{client_id}{suffix}")
+        print(f"✓ Subscribed to: alerts/client/{client_id} (+ .zstd/.mp variants)")
     else:
         print(f"✗ Connection failed with code {rc}")
 
@@ -29,8 +37,24 @@ def on_connect(client, userdata, flags, rc):
 def on_message(client, userdata, msg):
     """Handle incoming alert messages."""
     try:
-        alert = json.loads(msg.payload.decode())
-        
+        topic = msg.topic
+        payload = msg.payload
+        if topic.endswith(".zstd"):
+            payload = _decompressor.decompress(payload)
+            topic = topic[:-len(".zstd")]
+        if topic.endswith(".mp"):
+            alert = msgspec.msgpack.decode(payload)
+        else:
+            alert = orjson.loads(payload)
+
+        # Dense tile lists arrive compacted as [start, end) ranges
+        if alert.get('tile_ranges'):
+            alert['affected_areas'] = [
+                tile
+                for start, end in alert['tile_ranges']
+                for tile in range(start, end)
+            ]
+
         print("\n" + "=" * 60)
         print(f"🚨 ALERT RECEIVED on {msg.topic}")
         print("=" * 60)
@@ -42,7 +66,7 @@ def on_message(client, userdata, msg):
         print(f"Affected Areas: {alert.get('affected_areas')}")
         print("=" * 60 + "\n")
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"✗ Failed to decode alert: {e}")
     except Exception as e:
         print(f"✗ Error processing alert: {e}")
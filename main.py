@@ -3,7 +3,7 @@ import time
 import signal
 import sys
 from mqtt_handler import MQTTAlertHandler
-from models import EmergencyEvent, Alert
+from models import EmergencyEventStruct, Alert
 import logging
 
 logging.basicConfig(
@@ -24,7 +24,8 @@ class AlertService:
         client_port = int(os.getenv('MQTT_PORT', 1884))
         simulator_topic = os.getenv('SIMULATOR_TOPIC', 'stadium/events/alerts')
         client_topic_prefix = os.getenv('CLIENT_TOPIC_PREFIX', 'alerts/client')
-        
+        wire_format = os.getenv('WIRE_FORMAT', 'json')
+
         # Initialize MQTT handler with dual broker support
         self.mqtt_handler = MQTTAlertHandler(
             simulator_broker=simulator_broker,
@@ -32,7 +33,8 @@ class AlertService:
             client_broker=client_broker,
             client_port=client_port,
             simulator_topic=simulator_topic,
-            client_topic_prefix=client_topic_prefix
+            client_topic_prefix=client_topic_prefix,
+            wire_format=wire_format
         )
         
         # Set custom message handler if needed
@@ -40,12 +42,12 @@ class AlertService:
         
         self.running = False
         
-    def process_emergency_event(self, event: EmergencyEvent):
+    def process_emergency_event(self, event: EmergencyEventStruct):
         """
         Custom logic to process emergency events from the simulator.
         You can add business logic here (e.g., filtering, validation, enrichment).
         """
-        logger.info(f"Processing emergency event: {event.event_type}")
+        logger.info("Processing emergency event: %s", event.event_type)
         
         # Create alert from event
         alert = self.mqtt_handler._create_alert_from_event(event)
@@ -75,7 +77,7 @@ class AlertService:
         except KeyboardInterrupt:
             logger.info("\nShutting down gracefully...")
         except Exception as e:
-            logger.error(f"Error in Alert Service: {e}")
+            logger.error("Error in Alert Service: %s", e)
         finally:
             self.stop()
     
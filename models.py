@@ -1,16 +1,30 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from array import array
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
-from datetime import datetime
+from functools import cached_property
+from typing import Optional, Union
+from datetime import datetime, timezone
+import ciso8601
+import msgspec
 
+# Cached tz singleton: datetime.now(_UTC) skips the OS local-time
+# conversion that naive datetime.now() pays on every call
+_UTC = timezone.utc
 
-# Basic Models
+
+# Basic Models. These are immutable value objects once validated, so
+# they are frozen: no accidental mutation, and instances are hashable.
 class Boundary(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     x_bound: tuple[float, float]
     y_bound: tuple[float, float]
 
 
 class Pos(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     x: int
     y: int
 
@@ -22,6 +36,8 @@ class EntityType(Enum):
 
 
 class Entity(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     type: EntityType
     pos: Pos
@@ -51,6 +67,8 @@ class AlertType(Enum):
 
 class EmergencyEvent(BaseModel):
     """Incoming event from stadium simulator"""
+    model_config = ConfigDict(frozen=True)
+
     event_id: str
     event_type: str
     timestamp: datetime
@@ -60,29 +78,100 @@ class EmergencyEvent(BaseModel):
     severity: str
     metadata: Optional[dict] = None
     details: Optional[dict] = None
-    
-    def get_details(self) -> dict:
-        """Get details/metadata regardless of which field is used"""
+
+    @cached_property
+    def details_view(self) -> dict:
+        """Details/metadata regardless of which field is used, resolved once.
+
+        cached_property stores straight into the instance __dict__, so it
+        works on the frozen model and repeated reads skip the fallbacks.
+        """
+        return self.metadata or self.details or {}
+
+
+class EmergencyEventStruct(msgspec.Struct, frozen=True):
+    """msgspec analog of EmergencyEvent, used on the hot ingest path.
+
+    A preconstructed msgspec decoder binds JSON straight into this struct
+    in one C-level pass, skipping the intermediate dict and pydantic
+    validation that EmergencyEvent(**payload) would pay per message.
+    """
+    event_id: str
+    event_type: str
+    # Kept as the raw ISO-8601 string: most events pass it straight
+    # through to the outgoing payload, so parsing to datetime per message
+    # would be wasted work (use ciso8601 at the point a datetime is needed)
+    timestamp: str
+    severity: str
+    location_id: Optional[str] = None
+    location: Optional[dict] = None
+    level: Optional[int] = None
+    metadata: Optional[dict] = None
+    details: Optional[dict] = None
+
+    @property
+    def details_view(self) -> dict:
+        """Details/metadata regardless of which field is used.
+
+        A plain property: the struct has no __dict__ to cache into, and
+        the resolution is just two attribute loads - nothing to save.
+        """
         return self.metadata or self.details or {}
 
 
-class Alert(BaseModel):
-    """Alert to be sent to clients"""
+@dataclass(slots=True)
+class Alert:
+    """Alert to be sent to clients.
+
+    Internal object built after the incoming event has already been
+    validated on decode, so a slotted dataclass is enough - no per-field
+    validation, no per-instance __dict__.
+    """
     id: int
     type: AlertType
-    disabled_tiles: list = Field(default_factory=list)  # Tile IDs or Sector Names
     message: str
+    # Tile IDs or Sector Names; small collections are tuples, large
+    # numeric lists are packed into an array('I') (4 bytes per tile
+    # instead of a boxed int + list slot)
+    disabled_tiles: Union[tuple, list, array] = ()
     level: Optional[int] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
+    # Either a datetime or the event's raw ISO-8601 string, which is
+    # passed through to the outgoing payload without a parse round-trip
+    timestamp: Union[datetime, str] = field(default_factory=lambda: datetime.now(_UTC))
     severity: str = "HIGH"
-    
+    # ISO-8601 form of timestamp, formatted once at creation so fan-out
+    # does not re-run isoformat() per destination
+    iso_timestamp: Optional[str] = None
 
-class ClientAlert(BaseModel):
+    def isoformat(self) -> str:
+        """ISO-8601 timestamp, formatted once and cached."""
+        if self.iso_timestamp is None:
+            ts = self.timestamp
+            self.iso_timestamp = ts if isinstance(ts, str) else ts.isoformat()
+        return self.iso_timestamp
+
+    def timestamp_datetime(self) -> datetime:
+        """Timestamp as a datetime, parsed on demand for string timestamps."""
+        ts = self.timestamp
+        return ciso8601.parse_datetime(ts) if isinstance(ts, str) else ts
+
+
+@dataclass(slots=True)
+class ClientAlert:
     """Simplified alert format for client consumption"""
     alert_id: int
     alert_type: str
     message: str
-    level: Optional[int] = None
     timestamp: str
     severity: str
-    affected_areas: list = Field(default_factory=list)
\ No newline at end of file
+    affected_areas: tuple = ()
+    level: Optional[int] = None
+    # [start, end) pairs replacing affected_areas when a dense run of
+    # tile ids compacts well (e.g. evacuation storms)
+    tile_ranges: Optional[list] = None
+
+
+# Built once at import time: deriving a TypeAdapter walks the schema, so
+# consumers decoding/validating ClientAlert payloads should reuse this
+# instance instead of constructing their own per message.
+CLIENT_ALERT_ADAPTER = TypeAdapter(ClientAlert)
\ No newline at end of file
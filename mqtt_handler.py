@@ -1,13 +1,184 @@
 import paho.mqtt.client as mqtt
-import json
+import orjson
+import msgspec
+import zstandard
+from pydantic import ValidationError
+import itertools
 import logging
+import socket
+import threading
+import time
+from array import array
+from collections import deque
 from datetime import datetime
-from typing import Callable, Optional
-from models import EmergencyEvent, Alert, ClientAlert, AlertType
+from typing import Callable, Optional, Union
+from models import EmergencyEvent, EmergencyEventStruct, Alert, AlertType
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Event type -> alert type lookup, built once at import time from the
+# enum itself so new alert types are picked up automatically. Keys are
+# lowercased so the per-event normalization is a single .lower() call.
+_ALERT_TYPE_MAP = {t.value.lower(): t for t in AlertType}
+_ALERT_TYPE_MAP["fire_alert"] = AlertType.FIRE  # Simulator uses "fire_alert"
+_ALERT_TYPE_GET = _ALERT_TYPE_MAP.get
+
+# Prebound message formatter for alert messages
+_FORMAT_MESSAGE = "{}: {}".format
+
+# Payloads above this many bytes are zstd-compressed before publish and
+# published with a ".zstd" topic suffix so subscribers know to inflate
+_COMPRESS_THRESHOLD = 256
+
+# Tile lists at least this long are packed into an array('I')
+_PACK_TILES_MIN = 64
+
+# Reusable per-thread scratch buffer for _encode_client_alert
+_encode_scratch = threading.local()
+
+# Built once; used when the wire format is msgpack
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+
+
+def _compact_tiles(tiles: list) -> Optional[list]:
+    """Collapse a dense list of int tile ids into [start, end) range pairs.
+
+    An evacuation alert carries hundreds of consecutive tile ids; sending
+    them as ranges shrinks the payload from kilobytes to tens of bytes.
+    Returns None when the list is small, contains non-int entries (sector
+    names), or would not shrink by at least ~30%.
+    """
+    if len(tiles) < 8:
+        return None
+    try:
+        ordered = sorted(set(tiles))
+    except TypeError:
+        return None
+    if not all(isinstance(t, int) for t in ordered):
+        return None
+
+    ranges = []
+    start = prev = ordered[0]
+    for t in ordered[1:]:
+        if t == prev + 1:
+            prev = t
+            continue
+        ranges.append([start, prev + 1])
+        start = prev = t
+    ranges.append([start, prev + 1])
+
+    # Two numbers per range vs one per tile: require a real saving
+    if 2 * len(ranges) > 0.7 * len(ordered):
+        return None
+    return ranges
+
+
+def _alert_from_event(alert_id: int, event: Union[EmergencyEvent, EmergencyEventStruct]) -> Alert:
+    """Build an Alert from an emergency event; shared by both handlers."""
+    alert_type = _ALERT_TYPE_GET(event.event_type.lower(), AlertType.SECURITY)
+
+    # Get details/metadata from event
+    details = event.details_view
+
+    # Simulator sends 'affected_areas' (list of strings/sectors)
+    # Alert model uses 'disabled_tiles' (generic list)
+    areas = details.get("affected_areas", details.get("disabled_tiles", ()))
+    if len(areas) >= _PACK_TILES_MIN:
+        try:
+            # Pack large numeric tile lists into contiguous C uint32s
+            areas = array("I", areas)
+        except (TypeError, OverflowError):
+            # Sector names or out-of-range ids: immutable tuple instead
+            areas = tuple(areas)
+    else:
+        # Small area lists become tuples - lighter than lists and safe
+        # to share since the alert is never mutated after creation
+        areas = tuple(areas)
+
+    # Struct events carry the raw ISO string; pydantic events a datetime.
+    # Either way the outgoing ISO form is fixed here, once.
+    ts = event.timestamp
+    return Alert(
+        id=alert_id,
+        type=alert_type,
+        disabled_tiles=areas,
+        message=_FORMAT_MESSAGE(event.event_type, details.get('description', 'Emergency detected')),
+        timestamp=ts,
+        iso_timestamp=ts if isinstance(ts, str) else ts.isoformat(),
+        severity=event.severity,
+        level=event.level
+    )
+
+
+def _wire_areas(alert: Alert) -> tuple:
+    """Resolve (affected_areas, tile_ranges) for the outgoing payload."""
+    tile_ranges = _compact_tiles(alert.disabled_tiles)
+    if tile_ranges is not None:
+        areas = []
+    elif isinstance(alert.disabled_tiles, array):
+        # Packed tiles that did not compact still serialize as a plain list
+        areas = list(alert.disabled_tiles)
+    else:
+        areas = alert.disabled_tiles
+    return areas, tile_ranges
+
+
+def _encode_alert(alert: Alert) -> bytes:
+    """Encode an Alert straight into its client JSON payload.
+
+    The renamed fields (id -> alert_id, type -> alert_type,
+    disabled_tiles -> affected_areas) are projected directly off the
+    Alert - no intermediate ClientAlert instance or dict. Key prefixes
+    are pre-encoded byte constants and the working buffer is a
+    thread-local bytearray reused across calls; orjson handles only the
+    parts that need escaping. ClientAlert in models.py stays as the
+    documented wire schema.
+    """
+    areas, tile_ranges = _wire_areas(alert)
+
+    try:
+        buf = _encode_scratch.buf
+        buf.clear()
+    except AttributeError:
+        buf = _encode_scratch.buf = bytearray()
+
+    buf += b'{"alert_id":'
+    buf += str(alert.id).encode()
+    buf += b',"alert_type":"'
+    buf += alert.type.value.encode()  # enum values: no escaping needed
+    buf += b'","message":'
+    buf += orjson.dumps(alert.message)
+    buf += b',"level":'
+    buf += b'null' if alert.level is None else str(alert.level).encode()
+    buf += b',"timestamp":'
+    # Struct events pass the timestamp string through unparsed, so it
+    # must be escaped like any other wire-sourced string
+    buf += orjson.dumps(alert.isoformat())
+    buf += b',"severity":'
+    buf += orjson.dumps(alert.severity)
+    buf += b',"affected_areas":'
+    buf += orjson.dumps(areas)
+    buf += b',"tile_ranges":'
+    buf += orjson.dumps(tile_ranges)
+    buf += b'}'
+    return bytes(buf)
+
+
+def _encode_alert_msgpack(alert: Alert) -> bytes:
+    """MessagePack encoding of the same wire schema as _encode_alert."""
+    areas, tile_ranges = _wire_areas(alert)
+    return _MSGPACK_ENCODER.encode({
+        "alert_id": alert.id,
+        "alert_type": alert.type.value,
+        "message": alert.message,
+        "level": alert.level,
+        "timestamp": alert.isoformat(),
+        "severity": alert.severity,
+        "affected_areas": areas,
+        "tile_ranges": tile_ranges,
+    })
+
 
 class MQTTAlertHandler:
     """
@@ -16,21 +187,31 @@ class MQTTAlertHandler:
     - Publishes alerts to clients (via client broker)
     """
     
-    def __init__(self, 
+    def __init__(self,
                  simulator_broker: str, simulator_port: int,
                  client_broker: str, client_port: int,
                  simulator_topic: str = "stadium/events/alerts",
-                 client_topic_prefix: str = "alerts/client"):
+                 client_topic_prefix: str = "alerts/client",
+                 wire_format: str = "json"):
         # Simulator broker connection (for receiving events)
         self.simulator_broker = simulator_broker
         self.simulator_port = simulator_port
         self.simulator_topic = simulator_topic
-        
+
         # Client broker connection (for publishing alerts)
         self.client_broker = client_broker
         self.client_port = client_port
         self.client_topic_prefix = client_topic_prefix
-        self.broadcast_topic = "alerts/broadcast"
+
+        # Wire format for the service-to-client channel: msgpack payloads
+        # are smaller and cheaper to (de)code, signalled by a .mp topic
+        # suffix so JSON subscribers are unaffected
+        if wire_format not in ("json", "msgpack"):
+            raise ValueError(f"Unsupported wire format: {wire_format}")
+        self.wire_format = wire_format
+        self._encode = _encode_alert_msgpack if wire_format == "msgpack" else _encode_alert
+        self._topic_suffix = ".mp" if wire_format == "msgpack" else ""
+        self.broadcast_topic = "alerts/broadcast" + self._topic_suffix
         
         # Separate MQTT clients for each broker
         self.simulator_client = mqtt.Client(client_id="alert_service_receiver")
@@ -41,153 +222,354 @@ class MQTTAlertHandler:
         self.client_publisher = mqtt.Client(client_id="alert_service_publisher")
         self.client_publisher.on_connect = self._on_client_connect
         self.client_publisher.on_disconnect = self._on_client_disconnect
+        self.client_publisher.on_publish = self._on_publish
         
-        self.alert_id_counter = 0
+        # itertools.count's __next__ runs in C under the GIL, so ids stay
+        # unique without a lock even when the ingest workers and the
+        # service thread create alerts concurrently
+        self._id_gen = itertools.count(1)
         self.message_callback: Optional[Callable] = None
-        
-    def set_message_callback(self, callback: Callable[[EmergencyEvent], None]):
+        # Per-message dispatch slot: either the user callback or the
+        # default convert-and-broadcast path, picked once instead of
+        # branching on message_callback for every message
+        self._dispatch: Callable = self._default_dispatch
+
+        # Outbound batching: alerts are queued here and drained in short
+        # bursts so per-publish overhead is amortized during storms. While
+        # the drain thread is not running (e.g. before start()), enqueued
+        # alerts are flushed inline.
+        self._outbox: deque = deque()
+        self._outbox_event = threading.Event()
+        self._outbox_batch_size = 64
+        self._outbox_interval = 0.005  # seconds
+        self._drain_thread: Optional[threading.Thread] = None
+        self._draining = False
+        # Alerts published since the drain thread last reported; per-alert
+        # success logs are DEBUG, the drain thread reports totals at INFO
+        self._dispatched_count = 0
+
+        # Inbound decoupling: the paho network thread only appends raw
+        # payloads here; worker threads decode and dispatch. Bounded with
+        # drop-oldest so a storm cannot grow memory without limit, and
+        # PUBACKs to the simulator broker are never delayed by dispatch.
+        # While the workers are not running, messages are processed inline.
+        self._ingress: deque = deque(maxlen=10_000)
+        self._ingress_event = threading.Event()
+        self._ingest_threads: list = []
+        self._ingest_workers = 2
+        self._ingest_running = False
+
+        # QoS 1 confirms are handled out-of-band in _on_publish; this maps
+        # paho message id -> alert id for publishes awaiting their PUBACK
+        self._inflight: dict = {}
+
+        # Last serialized alert (alert id, payload bytes), so fanning the
+        # same alert out to several destinations encodes it only once
+        self._alert_payload_cache: Optional[tuple] = None
+
+        # Built once; compressing a large payload costs microseconds and
+        # saves kilobytes per subscriber on the wire
+        self._compressor = zstandard.ZstdCompressor(level=3)
+
+        # client_id -> prebuilt topic string, so repeat sends to the same
+        # client skip the per-call f-string
+        self._topic_cache: dict = {}
+
+        # Reused across messages: constructing the decoder bakes the field
+        # layout once, so each decode is a single C call
+        self._event_decoder = msgspec.json.Decoder(EmergencyEventStruct)
+
+    def set_message_callback(self, callback: Callable[[EmergencyEventStruct], None]):
         """Set a callback function to process incoming emergency events."""
         self.message_callback = callback
+        self._dispatch = callback if callback else self._default_dispatch
+
+    def _default_dispatch(self, event: Union[EmergencyEvent, EmergencyEventStruct]):
+        """Default per-event behavior: convert and broadcast."""
+        self.broadcast_alert(self._create_alert_from_event(event))
     
     def _on_simulator_connect(self, client, userdata, flags, rc):
         """Handler for MQTT connection event to simulator broker."""
         if rc == 0:
-            logger.info(f"[SIMULATOR] Connected to broker at {self.simulator_broker}:{self.simulator_port}")
+            logger.info("[SIMULATOR] Connected to broker at %s:%s", self.simulator_broker, self.simulator_port)
+            # Tuned here rather than in start() so paho's auto-reconnects
+            # get the same socket options on their fresh sockets
+            self._tune_socket(client)
             client.subscribe(self.simulator_topic)
-            logger.info(f"[SIMULATOR] Subscribed to topic: {self.simulator_topic}")
+            logger.info("[SIMULATOR] Subscribed to topic: %s", self.simulator_topic)
         else:
-            logger.error(f"[SIMULATOR] Connection failed with code {rc}")
+            logger.error("[SIMULATOR] Connection failed with code %s", rc)
     
     def _on_client_connect(self, client, userdata, flags, rc):
         """Handler for MQTT connection event to client broker."""
         if rc == 0:
-            logger.info(f"[CLIENT] Connected to broker at {self.client_broker}:{self.client_port}")
+            logger.info("[CLIENT] Connected to broker at %s:%s", self.client_broker, self.client_port)
+            self._tune_socket(client)
         else:
-            logger.error(f"[CLIENT] Connection failed with code {rc}")
+            logger.error("[CLIENT] Connection failed with code %s", rc)
     
     def _on_simulator_disconnect(self, client, userdata, rc):
         """Handler for MQTT disconnection event from simulator broker."""
         if rc != 0:
-            logger.warning(f"Unexpected disconnection from simulator broker. Code: {rc}")
+            logger.warning("Unexpected disconnection from simulator broker. Code: %s", rc)
     
     def _on_client_disconnect(self, client, userdata, rc):
         """Handler for MQTT disconnection event from client broker."""
         if rc != 0:
-            logger.warning(f"Unexpected disconnection from client broker. Code: {rc}")
+            logger.warning("Unexpected disconnection from client broker. Code: %s", rc)
     
     def _on_message(self, client, userdata, msg):
-        """Process incoming MQTT messages with emergency data."""
+        """Receive callback: hand the raw payload off and return immediately."""
+        if self._ingest_running:
+            self._ingress.append(msg.payload)
+            self._ingress_event.set()
+        else:
+            self._process_payload(msg.payload)
+
+    def _ingest_worker(self):
+        """Worker loop: decode queued payloads and dispatch them."""
+        while self._ingest_running:
+            self._ingress_event.wait(0.05)
+            self._ingress_event.clear()
+            self._drain_ingress()
+        # Process anything still queued at shutdown
+        self._drain_ingress()
+
+    def _drain_ingress(self):
+        while True:
+            try:
+                raw = self._ingress.popleft()
+            except IndexError:
+                break
+            self._process_payload(raw)
+
+    def _process_payload(self, raw: bytes):
+        """Decode a raw event payload and dispatch it."""
         try:
-            payload = json.loads(msg.payload.decode())
-            logger.info(f"[SIMULATOR] Received emergency event: {payload.get('event_type', 'UNKNOWN')}")
-            
-            # Parse incoming event
-            event = EmergencyEvent(**payload)
-            
-            # Call custom callback if set
-            if self.message_callback:
-                self.message_callback(event)
-            else:
-                # Default behavior: convert and broadcast
-                alert = self._create_alert_from_event(event)
-                self.broadcast_alert(alert)
-                
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON: {e}")
+            try:
+                # Single parse+bind pass straight from the raw bytes
+                event = self._event_decoder.decode(raw)
+            except msgspec.ValidationError:
+                # Valid JSON that doesn't bind strictly to the struct
+                # (e.g. stringly-typed numbers); pydantic's one-pass
+                # parse+validate still coerces these without an
+                # intermediate dict
+                event = EmergencyEvent.model_validate_json(raw)
+            logger.debug("[SIMULATOR] Received emergency event: %s", event.event_type)
+
+            # Either the custom callback or the default convert-and-broadcast
+            self._dispatch(event)
+
+
+        except (msgspec.DecodeError, ValidationError) as e:
+            logger.error("Failed to decode JSON: %s", e)
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
     
-    def _create_alert_from_event(self, event: EmergencyEvent) -> Alert:
+    def _create_alert_from_event(self, event: Union[EmergencyEvent, EmergencyEventStruct]) -> Alert:
         """Convert an emergency event to an alert."""
-        self.alert_id_counter += 1
-        
-        # Map event type to alert type
-        alert_type_map = {
-            "FIRE": AlertType.FIRE,
-            "FIRE_ALERT": AlertType.FIRE,  # Simulator uses "fire_alert"
-            "SECURITY": AlertType.SECURITY,
-            "MEDICAL": AlertType.MEDICAL,
-            "EVACUATION": AlertType.EVACUATION
-        }
-        
-        alert_type = alert_type_map.get(event.event_type.upper(), AlertType.SECURITY)
-        
-        # Get details/metadata from event
-        details = event.get_details()
-        
-        # Simulator sends 'affected_areas' (list of strings/sectors)
-        # Alert model uses 'disabled_tiles' (generic list)
-        areas = details.get("affected_areas", details.get("disabled_tiles", []))
-        
-        return Alert(
-            id=self.alert_id_counter,
-            type=alert_type,
-            disabled_tiles=areas,
-            message=f"{event.event_type}: {details.get('description', 'Emergency detected')}",
-            timestamp=event.timestamp,
-            severity=event.severity,
-            level=event.level
-        )
+        return _alert_from_event(next(self._id_gen), event)
     
+    def _serialize_alert(self, alert: Alert) -> bytes:
+        """Serialize an alert to its client payload, caching the last result.
+
+        When one alert is both broadcast and sent to specific clients, the
+        JSON is built once and the same bytes are published per destination.
+        """
+        cached = self._alert_payload_cache
+        if cached is not None and cached[0] == alert.id:
+            return cached[1]
+
+        payload = self._encode(alert)
+        self._alert_payload_cache = (alert.id, payload)
+        return payload
+
+    def _maybe_compress(self, topic: str, payload: bytes) -> tuple:
+        """Compress payloads above the size threshold, marking the topic."""
+        if len(payload) > _COMPRESS_THRESHOLD:
+            return topic + ".zstd", self._compressor.compress(payload)
+        return topic, payload
+
     def broadcast_alert(self, alert: Alert):
         """Send alert to all clients via broadcast topic."""
-        client_alert = ClientAlert(
-            alert_id=alert.id,
-            alert_type=alert.type.value,
-            message=alert.message,
-            timestamp=alert.timestamp.isoformat(),
-            severity=alert.severity,
-            affected_areas=alert.disabled_tiles,
-            level=alert.level
-        )
-        
-        payload = client_alert.model_dump_json()
-        result = self.client_publisher.publish(self.broadcast_topic, payload, qos=1)
-        
-        if result.rc == mqtt.MQTT_ERR_SUCCESS:
-            logger.info(f"[CLIENT] Published alert {alert.id} to topic: {self.broadcast_topic} (Level: {alert.level})")
-        else:
-            logger.error(f"[CLIENT] Failed to publish alert {alert.id}")
-    
+        topic, payload = self._maybe_compress(self.broadcast_topic, self._serialize_alert(alert))
+        self._enqueue_publish(topic, payload, alert.id)
+
+    def _client_topic(self, client_id: str) -> str:
+        """Topic for a specific client, built once per client id."""
+        topic = self._topic_cache.get(client_id)
+        if topic is None:
+            topic = self._topic_cache.setdefault(
+                client_id, f"{self.client_topic_prefix}/{client_id}{self._topic_suffix}"
+            )
+        return topic
+
     def send_alert_to_client(self, client_id: str, alert: Alert):
         """Send alert to a specific client."""
-        client_alert = ClientAlert(
-            alert_id=alert.id,
-            alert_type=alert.type.value,
-            message=alert.message,
-            timestamp=alert.timestamp.isoformat(),
-            severity=alert.severity,
-            affected_areas=alert.disabled_tiles,
-            level=alert.level
+        topic, payload = self._maybe_compress(
+            self._client_topic(client_id), self._serialize_alert(alert)
         )
-        
-        topic = f"{self.client_topic_prefix}/{client_id}"
-        payload = client_alert.model_dump_json()
-        result = self.client_publisher.publish(topic, payload, qos=1)
-        
-        if result.rc == mqtt.MQTT_ERR_SUCCESS:
-            logger.info(f"[CLIENT] Published alert {alert.id} to topic: {topic}")
+        self._enqueue_publish(topic, payload, alert.id)
+
+    def fan_out(self, client_ids: list, alert: Alert):
+        """Send one alert to many specific clients.
+
+        The payload is serialized (and compressed) exactly once; each
+        target only adds an outbox entry, and the drain thread flushes
+        the whole batch back to back under a single wakeup.
+        """
+        payload = self._serialize_alert(alert)
+        suffix = ""
+        if len(payload) > _COMPRESS_THRESHOLD:
+            payload = self._compressor.compress(payload)
+            suffix = ".zstd"
+
+        append = self._outbox.append
+        client_topic = self._client_topic
+        alert_id = alert.id
+        for client_id in client_ids:
+            topic = client_topic(client_id)
+            if suffix:
+                topic += suffix
+            append((topic, payload, alert_id))
+
+        if self._draining:
+            self._outbox_event.set()
         else:
-            logger.error(f"[CLIENT] Failed to send alert to client {client_id}")
+            self._flush_outbox()
+
+    def _enqueue_publish(self, topic: str, payload: bytes, alert_id: int):
+        """Queue a publish; the drain thread flushes queued alerts in bursts."""
+        self._outbox.append((topic, payload, alert_id))
+        if self._draining:
+            if len(self._outbox) >= self._outbox_batch_size:
+                self._outbox_event.set()
+        else:
+            self._flush_outbox()
+
+    def _flush_outbox(self):
+        """Publish everything currently queued, back to back.
+
+        Publishes are not confirmed here - the producer enqueues and moves
+        on, and _on_publish logs delivery when the PUBACK arrives. Waiting
+        on each confirm would serialize the whole flush on broker round
+        trips.
+        """
+        publish = self.client_publisher.publish
+        published = 0
+        while True:
+            try:
+                topic, payload, alert_id = self._outbox.popleft()
+            except IndexError:
+                break
+            info = publish(topic, payload, qos=1)
+            if info.rc in (mqtt.MQTT_ERR_SUCCESS, mqtt.MQTT_ERR_NO_CONN):
+                # NO_CONN means paho queued the message for reconnect
+                self._inflight[info.mid] = alert_id
+                published += 1
+            else:
+                logger.error("[CLIENT] Failed to publish alert %s (rc=%s)", alert_id, info.rc)
+        self._dispatched_count += published
+
+    def _on_publish(self, client, userdata, mid):
+        """Handler for PUBACK confirms from the client broker."""
+        alert_id = self._inflight.pop(mid, None)
+        if alert_id is not None:
+            logger.debug("[CLIENT] Delivery confirmed for alert %s", alert_id)
+
+    def _drain_outbox(self):
+        """Drain loop: flush the outbox every few ms or when a batch fills up."""
+        last_report = time.monotonic()
+        while self._draining:
+            self._outbox_event.wait(self._outbox_interval)
+            self._outbox_event.clear()
+            if self._outbox:
+                self._flush_outbox()
+            # One aggregate INFO line per second instead of one per alert
+            now = time.monotonic()
+            if now - last_report >= 1.0:
+                if self._dispatched_count:
+                    logger.info("[CLIENT] Dispatched %d alerts in the last second",
+                                self._dispatched_count)
+                    self._dispatched_count = 0
+                last_report = now
+        # Final flush so nothing queued at shutdown is dropped
+        self._flush_outbox()
     
+    def _tune_socket(self, client: mqtt.Client):
+        """Disable Nagle (and delayed ACKs where available) on a connected client.
+
+        Without this, PUBACKs for low-rate QoS 1 traffic can sit in the
+        kernel for tens of milliseconds waiting for coalescing, which
+        throttles per-connection throughput.
+        """
+        sock = client.socket()
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, "TCP_QUICKACK"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            # Let the kernel absorb publish bursts without backpressure
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 * 1024 * 1024)
+        except OSError as e:
+            logger.warning("Could not tune MQTT socket options: %s", e)
+
     def start(self):
         """Start the MQTT clients and connect to both brokers."""
         try:
-            # Connect to simulator broker (to receive events)
+            # Start the decode/dispatch workers before events can arrive
+            self._ingest_running = True
+            for i in range(self._ingest_workers):
+                worker = threading.Thread(
+                    target=self._ingest_worker, name=f"alert-ingest-{i}", daemon=True
+                )
+                worker.start()
+                self._ingest_threads.append(worker)
+
+            # Connect to simulator broker (to receive events); socket
+            # options are applied in the on_connect callback so they
+            # survive auto-reconnects
             self.simulator_client.connect(self.simulator_broker, self.simulator_port, keepalive=60)
             self.simulator_client.loop_start()
-            
-            # Connect to client broker (to publish alerts)
+
+            # Connect to client broker (to publish alerts). Paho's default
+            # of 20 unacked QoS>0 messages throttles storm fan-out, so
+            # raise the windows well above any expected burst.
+            self.client_publisher.max_inflight_messages_set(1000)
+            self.client_publisher.max_queued_messages_set(100_000)
             self.client_publisher.connect(self.client_broker, self.client_port, keepalive=60)
             self.client_publisher.loop_start()
-            
+
+            # Start draining the outbound alert queue
+            self._draining = True
+            self._drain_thread = threading.Thread(
+                target=self._drain_outbox, name="alert-outbox-drain", daemon=True
+            )
+            self._drain_thread.start()
+
             logger.info("Alert Service MQTT Handler started")
         except Exception as e:
-            logger.error(f"Failed to connect to MQTT brokers: {e}")
+            logger.error("Failed to connect to MQTT brokers: %s", e)
             raise
     
     def stop(self):
         """Stop both MQTT clients."""
+        # Stop the ingest workers; each drains the queue a final time
+        if self._ingest_threads:
+            self._ingest_running = False
+            self._ingress_event.set()
+            for worker in self._ingest_threads:
+                worker.join(timeout=1.0)
+            self._ingest_threads = []
+
+        # Stop the drain thread first so queued alerts get a final flush
+        if self._drain_thread is not None:
+            self._draining = False
+            self._outbox_event.set()
+            self._drain_thread.join(timeout=1.0)
+            self._drain_thread = None
+
         self.simulator_client.loop_stop()
         self.simulator_client.disconnect()
         
@@ -18,7 +18,7 @@ def sample_emergency_event():
         }
     }
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_mqtt_config():
     """MQTT configuration for testing."""
     return {
@@ -30,6 +30,59 @@ def sample_mqtt_config():
         "client_topic_prefix": "alerts/client"
     }
 
+@pytest.fixture(scope="session")
+def service_env():
+    """Service configuration environment, applied once per session.
+
+    Cheaper than per-test patch.dict('os.environ', ...), which copies and
+    restores the whole environment around every test, and safe under
+    parallel workers since each worker process applies it independently.
+    """
+    env = {
+        'SIMULATOR_BROKER': 'test-broker',
+        'SIMULATOR_PORT': '1885',
+        'MQTT_BROKER': 'client-broker',
+        'MQTT_PORT': '1886',
+        'SIMULATOR_TOPIC': 'test/topic',
+        'CLIENT_TOPIC_PREFIX': 'test/alerts'
+    }
+    mp = pytest.MonkeyPatch()
+    for key, value in env.items():
+        mp.setenv(key, value)
+    yield env
+    mp.undo()
+
+@pytest.fixture(scope="module")
+def _module_mqtt_handler(sample_mqtt_config):
+    """One MQTTAlertHandler per test module.
+
+    Constructing the handler builds two paho Client objects and their
+    internal state, which dominates suite runtime when repeated per test;
+    the per-test `mqtt_handler` fixture resets the mutable state instead.
+    """
+    from mqtt_handler import MQTTAlertHandler
+    return MQTTAlertHandler(**sample_mqtt_config)
+
+@pytest.fixture
+def mqtt_handler(_module_mqtt_handler):
+    """Shared handler with mocked MQTT clients, reset for each test."""
+    import itertools
+    handler = _module_mqtt_handler
+    handler.simulator_client = Mock()
+    handler.client_publisher = Mock()
+    handler.client_publisher.publish = Mock(return_value=Mock(rc=0))
+    handler._id_gen = itertools.count(1)
+    handler.message_callback = None
+    handler._dispatch = handler._default_dispatch
+    handler._draining = False
+    handler._ingest_running = False
+    handler._outbox.clear()
+    handler._ingress.clear()
+    handler._inflight.clear()
+    handler._alert_payload_cache = None
+    handler._topic_cache.clear()
+    return handler
+
 @pytest.fixture
 def mock_mqtt_client():
     """Mock MQTT client."""
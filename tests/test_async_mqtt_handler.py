@@ -0,0 +1,57 @@
+import pytest
+import json
+from datetime import datetime
+from unittest.mock import Mock, AsyncMock
+from async_mqtt_handler import AsyncMQTTAlertHandler
+from models import EmergencyEvent, AlertType
+
+class TestAsyncMQTTAlertHandler:
+    """Test AsyncMQTTAlertHandler class."""
+
+    def test_create_alert_from_event(self, sample_mqtt_config):
+        """Test converting EmergencyEvent to Alert in the async handler."""
+        handler = AsyncMQTTAlertHandler(**sample_mqtt_config)
+
+        event = EmergencyEvent(
+            event_id="fire-001",
+            event_type="FIRE",
+            timestamp=datetime.now(),
+            severity="CRITICAL",
+            metadata={"description": "Major fire", "disabled_tiles": [201, 202]}
+        )
+
+        alert = handler._create_alert_from_event(event)
+
+        assert alert.id == 1
+        assert alert.type == AlertType.FIRE
+        assert alert.disabled_tiles == (201, 202)
+        assert "Major fire" in alert.message
+
+    @pytest.mark.asyncio
+    async def test_broadcast_alert_publishes(self, sample_mqtt_config, mock_emergency_event):
+        """Test that broadcast_alert publishes the encoded payload."""
+        handler = AsyncMQTTAlertHandler(**sample_mqtt_config)
+        handler._publisher = Mock()
+        handler._publisher.publish = AsyncMock()
+
+        alert = handler._create_alert_from_event(mock_emergency_event)
+        await handler.broadcast_alert(alert)
+
+        handler._publisher.publish.assert_awaited_once()
+        call_args = handler._publisher.publish.call_args
+        assert call_args[0][0] == "alerts/broadcast"
+        payload_dict = json.loads(call_args[0][1])
+        assert payload_dict["alert_id"] == alert.id
+
+    @pytest.mark.asyncio
+    async def test_handle_payload_with_callback(self, sample_mqtt_config, sample_emergency_event):
+        """Test that a decoded event reaches the message callback."""
+        handler = AsyncMQTTAlertHandler(**sample_mqtt_config)
+
+        received = []
+        handler.set_message_callback(received.append)
+
+        await handler._handle_payload(json.dumps(sample_emergency_event).encode())
+
+        assert len(received) == 1
+        assert received[0].event_id == "fire-001"
@@ -3,7 +3,6 @@ import json
 from datetime import datetime
 from unittest.mock import Mock, patch
 from main import AlertService
-from mqtt_handler import MQTTAlertHandler
 from models import EmergencyEvent, Alert, AlertType
 
 class TestIntegration:
@@ -15,8 +14,9 @@ class TestIntegration:
         # Create service
         service = AlertService()
         
-        # Mock MQTT handler
-        mock_handler = Mock(spec=MQTTAlertHandler)
+        # Mock MQTT handler; plain Mock since the methods under test are
+        # reassigned below and nothing asserts on spec enforcement
+        mock_handler = Mock()
         mock_handler._create_alert_from_event = Mock()
         mock_handler.broadcast_alert = Mock()
         service.mqtt_handler = mock_handler
@@ -57,26 +57,22 @@ class TestIntegration:
             severity="CRITICAL"
         )
         
-        # Simulate what MQTT handler does
-        from models import ClientAlert
-        client_alert = ClientAlert(
-            alert_id=alert.id,
-            alert_type=alert.type.value,
-            message=alert.message,
-            timestamp=alert.timestamp.isoformat(),
-            severity=alert.severity,
-            affected_areas=alert.disabled_tiles
-        )
-        
-        # Serialize to JSON
-        json_str = client_alert.model_dump_json()
-        
+        # Serialize to JSON the way the MQTT handler does
+        from mqtt_handler import _encode_alert
+        payload = _encode_alert(alert)
+
         # Deserialize back
-        data = json.loads(json_str)
+        data = json.loads(payload)
         
         # Verify data integrity
         assert data["alert_id"] == 999
         assert data["alert_type"] == "EVACUATION"
         assert data["message"] == "Evacuation required"
         assert data["severity"] == "CRITICAL"
-        assert data["affected_areas"] == [501, 502, 503]
\ No newline at end of file
+        assert data["affected_areas"] == [501, 502, 503]
+
+        # The payload also round-trips through the typed consumer adapter
+        from models import CLIENT_ALERT_ADAPTER
+        typed = CLIENT_ALERT_ADAPTER.validate_json(payload)
+        assert typed.alert_id == 999
+        assert typed.affected_areas == (501, 502, 503)
\ No newline at end of file
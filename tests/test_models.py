@@ -21,7 +21,7 @@ class TestModels:
         assert event.event_id == "fire-001"
         assert event.event_type == "FIRE"
         assert event.severity == "HIGH"
-        assert "Fire detected" in event.get_details()["description"]
+        assert "Fire detected" in event.details_view["description"]
     
     def test_emergency_event_without_metadata(self):
         """Test EmergencyEvent with details instead of metadata."""
@@ -36,14 +36,14 @@ class TestModels:
         assert event.event_id == "security-001"
         assert event.event_type == "SECURITY"
         assert event.severity == "MEDIUM"
-        assert "Security breach" in event.get_details()["description"]
+        assert "Security breach" in event.details_view["description"]
     
     def test_alert_creation(self):
         """Test Alert creation."""
         alert = Alert(
             id=1,
             type=AlertType.FIRE,
-            disabled_tiles=[101, 102, 103],
+            disabled_tiles=(101, 102, 103),
             message="Fire detected in sector A",
             timestamp=datetime.now(),
             severity="HIGH"
@@ -51,7 +51,7 @@ class TestModels:
         
         assert alert.id == 1
         assert alert.type == AlertType.FIRE
-        assert alert.disabled_tiles == [101, 102, 103]
+        assert alert.disabled_tiles == (101, 102, 103)
         assert "Fire detected" in alert.message
         assert alert.severity == "HIGH"
     
@@ -64,7 +64,7 @@ class TestModels:
             message="Fire alert",
             timestamp=timestamp,
             severity="HIGH",
-            affected_areas=[101, 102]
+            affected_areas=(101, 102)
         )
         
         assert client_alert.alert_id == 1
@@ -72,7 +72,7 @@ class TestModels:
         assert client_alert.message == "Fire alert"
         assert client_alert.timestamp == timestamp
         assert client_alert.severity == "HIGH"
-        assert client_alert.affected_areas == [101, 102]
+        assert client_alert.affected_areas == (101, 102)
     
     def test_entity_models(self):
         """Test Entity, Node, and other basic models."""
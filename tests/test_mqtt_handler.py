@@ -1,9 +1,10 @@
 import pytest
 import json
+from dataclasses import asdict
 from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
-from mqtt_handler import MQTTAlertHandler
-from models import EmergencyEvent, Alert, AlertType
+from mqtt_handler import MQTTAlertHandler, _encode_alert
+from models import EmergencyEvent, EmergencyEventStruct, Alert, ClientAlert, AlertType
 
 class TestMQTTAlertHandler:
     """Test MQTTAlertHandler class."""
@@ -18,23 +19,20 @@ class TestMQTTAlertHandler:
         assert handler.client_port == 1884
         assert handler.simulator_topic == "stadium/events/alerts"
         assert handler.client_topic_prefix == "alerts/client"
-        assert handler.alert_id_counter == 0
+        assert next(handler._id_gen) == 1
         assert handler.message_callback is None
     
-    def test_set_message_callback(self, sample_mqtt_config):
+    def test_set_message_callback(self, mqtt_handler):
         """Test setting message callback."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
         # Create a mock callback
         mock_callback = Mock()
-        handler.set_message_callback(mock_callback)
-        
-        assert handler.message_callback == mock_callback
-    
-    def test_create_alert_from_event(self, sample_mqtt_config):
+        mqtt_handler.set_message_callback(mock_callback)
+
+        assert mqtt_handler.message_callback == mock_callback
+
+    def test_create_alert_from_event(self, mqtt_handler):
         """Test converting EmergencyEvent to Alert."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
+
         event = EmergencyEvent(
             event_id="fire-001",
             event_type="FIRE",
@@ -46,23 +44,22 @@ class TestMQTTAlertHandler:
             }
         )
         
-        alert = handler._create_alert_from_event(event)
-        
+        alert = mqtt_handler._create_alert_from_event(event)
+
         assert alert.id == 1  # First alert, ID should be 1
         assert alert.type == AlertType.FIRE
-        assert alert.disabled_tiles == [201, 202, 203]
+        assert alert.disabled_tiles == (201, 202, 203)
         assert "Major fire" in alert.message
         assert alert.severity == "CRITICAL"
         assert alert.timestamp == event.timestamp
         
         # Test counter increments
-        alert2 = handler._create_alert_from_event(event)
+        alert2 = mqtt_handler._create_alert_from_event(event)
         assert alert2.id == 2
-    
-    def test_create_alert_from_different_event_types(self, sample_mqtt_config):
+
+    def test_create_alert_from_different_event_types(self, mqtt_handler):
         """Test alert creation for different event types."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
+
         event_types = [
             ("FIRE", AlertType.FIRE),
             ("SECURITY", AlertType.SECURITY),
@@ -80,17 +77,11 @@ class TestMQTTAlertHandler:
                 metadata={"description": f"{event_type} event"}
             )
             
-            alert = handler._create_alert_from_event(event)
+            alert = mqtt_handler._create_alert_from_event(event)
             assert alert.type == expected_alert_type
-    
-    @patch('paho.mqtt.client.Client')
-    def test_broadcast_alert(self, mock_client_class, sample_mqtt_config):
+
+    def test_broadcast_alert(self, mqtt_handler):
         """Test broadcasting alert to all clients."""
-        # Setup
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        handler.client_publisher = Mock()
-        handler.client_publisher.publish = Mock(return_value=Mock(rc=0))
-        
         # Create test alert
         alert = Alert(
             id=1,
@@ -102,11 +93,11 @@ class TestMQTTAlertHandler:
         )
         
         # Call method
-        handler.broadcast_alert(alert)
-        
+        mqtt_handler.broadcast_alert(alert)
+
         # Verify
-        assert handler.client_publisher.publish.called
-        call_args = handler.client_publisher.publish.call_args
+        assert mqtt_handler.client_publisher.publish.called
+        call_args = mqtt_handler.client_publisher.publish.call_args
         assert call_args[0][0] == "alerts/broadcast"
         
         # Verify payload is valid JSON
@@ -117,14 +108,8 @@ class TestMQTTAlertHandler:
         assert payload_dict["message"] == "Test fire alert"
         assert payload_dict["severity"] == "HIGH"
     
-    @patch('paho.mqtt.client.Client')
-    def test_send_alert_to_client(self, mock_client_class, sample_mqtt_config):
+    def test_send_alert_to_client(self, mqtt_handler):
         """Test sending alert to specific client."""
-        # Setup
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        handler.client_publisher = Mock()
-        handler.client_publisher.publish = Mock(return_value=Mock(rc=0))
-        
         # Create test alert
         alert = Alert(
             id=2,
@@ -136,11 +121,11 @@ class TestMQTTAlertHandler:
         )
         
         # Call method
-        handler.send_alert_to_client("client_123", alert)
-        
+        mqtt_handler.send_alert_to_client("client_123", alert)
+
         # Verify
-        assert handler.client_publisher.publish.called
-        call_args = handler.client_publisher.publish.call_args
+        assert mqtt_handler.client_publisher.publish.called
+        call_args = mqtt_handler.client_publisher.publish.call_args
         assert call_args[0][0] == "alerts/client/client_123"
         
         # Verify payload
@@ -149,14 +134,229 @@ class TestMQTTAlertHandler:
         assert payload_dict["alert_id"] == 2
         assert payload_dict["alert_type"] == "MEDICAL"
     
-    def test_on_message_with_callback(self, sample_mqtt_config):
+    def test_encode_alert_matches_wire_schema(self):
+        """Test the specialized encoder against the ClientAlert wire schema."""
+        alert = Alert(
+            id=42,
+            type=AlertType.FIRE,
+            message='Fire with "quotes" and unicode: secção',
+            disabled_tiles=[101, "Sector A"],
+            timestamp=datetime.now(),
+            severity="HIGH",
+            level=2
+        )
+
+        expected = asdict(ClientAlert(
+            alert_id=42,
+            alert_type="FIRE",
+            message=alert.message,
+            timestamp=alert.isoformat(),
+            severity="HIGH",
+            affected_areas=[101, "Sector A"],
+            level=2
+        ))
+        assert json.loads(_encode_alert(alert)) == expected
+
+        # None level encodes as JSON null
+        alert_no_level = Alert(
+            id=43,
+            type=AlertType.MEDICAL,
+            message="No level",
+            timestamp=datetime.now(),
+            severity="LOW"
+        )
+        assert json.loads(_encode_alert(alert_no_level))["level"] is None
+
+        # String timestamps come straight off the wire and must be
+        # escaped - a quote in one must not break out of the JSON string
+        hostile_ts = 'evil" , "injected": 1, "x'
+        alert_hostile = Alert(
+            id=44,
+            type=AlertType.FIRE,
+            message="Timestamp escaping",
+            timestamp=hostile_ts,
+            severity="HIGH"
+        )
+        decoded = json.loads(_encode_alert(alert_hostile))
+        assert decoded["timestamp"] == hostile_ts
+        assert "injected" not in decoded
+
+    def test_large_tile_list_packed(self, mqtt_handler):
+        """Test that large numeric tile lists are stored as array('I')."""
+        from array import array
+
+        event = EmergencyEvent(
+            event_id="evac-001",
+            event_type="EVACUATION",
+            timestamp=datetime.now(),
+            severity="CRITICAL",
+            metadata={"disabled_tiles": list(range(100, 500))}
+        )
+
+        alert = mqtt_handler._create_alert_from_event(event)
+
+        assert isinstance(alert.disabled_tiles, array)
+        assert list(alert.disabled_tiles[:3]) == [100, 101, 102]
+        assert len(alert.disabled_tiles) == 400
+
+        # Large sector-name lists cannot be packed and become tuples
+        event_sectors = EmergencyEvent(
+            event_id="evac-002",
+            event_type="EVACUATION",
+            timestamp=datetime.now(),
+            severity="CRITICAL",
+            metadata={"affected_areas": [f"Sector {i}" for i in range(100)]}
+        )
+        alert_sectors = mqtt_handler._create_alert_from_event(event_sectors)
+        assert isinstance(alert_sectors.disabled_tiles, tuple)
+
+    def test_evacuation_tiles_sent_as_ranges(self, mqtt_handler):
+        """Test that a dense tile list is compacted into [start, end) ranges."""
+        alert = Alert(
+            id=5,
+            type=AlertType.EVACUATION,
+            disabled_tiles=list(range(100, 500)),
+            message="Evacuation required",
+            timestamp=datetime.now(),
+            severity="CRITICAL"
+        )
+
+        mqtt_handler.broadcast_alert(alert)
+
+        payload = json.loads(mqtt_handler.client_publisher.publish.call_args[0][1])
+        assert payload["tile_ranges"] == [[100, 500]]
+        assert payload["affected_areas"] == []
+
+        # Small or non-numeric lists are passed through untouched
+        from mqtt_handler import _compact_tiles
+        assert _compact_tiles([101, 102, 103]) is None
+        assert _compact_tiles(["Sector A", "Sector B"] * 10) is None
+        assert _compact_tiles(list(range(0, 100, 2))) is None
+
+    def test_msgpack_wire_format(self, sample_mqtt_config):
+        """Test broadcasting with the msgpack wire format."""
+        import msgspec
+
+        handler = MQTTAlertHandler(**sample_mqtt_config, wire_format="msgpack")
+        handler.client_publisher = Mock()
+        handler.client_publisher.publish = Mock(return_value=Mock(rc=0))
+
+        alert = Alert(
+            id=4,
+            type=AlertType.FIRE,
+            disabled_tiles=[101, 102],
+            message="Msgpack alert",
+            timestamp=datetime.now(),
+            severity="HIGH"
+        )
+
+        handler.broadcast_alert(alert)
+
+        call_args = handler.client_publisher.publish.call_args
+        assert call_args[0][0] == "alerts/broadcast.mp"
+        decoded = msgspec.msgpack.decode(call_args[0][1])
+        assert decoded["alert_id"] == 4
+        assert decoded["alert_type"] == "FIRE"
+        assert decoded["affected_areas"] == [101, 102]
+
+        # Unknown formats are rejected at construction
+        with pytest.raises(ValueError):
+            MQTTAlertHandler(**sample_mqtt_config, wire_format="xml")
+
+    def test_large_payload_compressed(self, mqtt_handler):
+        """Test that oversized payloads are zstd-compressed and marked."""
+        import zstandard
+
+        alert = Alert(
+            id=11,
+            type=AlertType.SECURITY,
+            disabled_tiles=[],
+            message="Detailed incident description. " * 30,
+            timestamp=datetime.now(),
+            severity="HIGH"
+        )
+
+        mqtt_handler.broadcast_alert(alert)
+
+        call_args = mqtt_handler.client_publisher.publish.call_args
+        assert call_args[0][0] == "alerts/broadcast.zstd"
+        decompressed = zstandard.ZstdDecompressor().decompress(call_args[0][1])
+        assert json.loads(decompressed)["alert_id"] == 11
+
+    def test_serialize_alert_reused_across_destinations(self, mqtt_handler):
+        """Test that fan-out of one alert reuses the serialized payload."""
+        alert = Alert(
+            id=7,
+            type=AlertType.SECURITY,
+            disabled_tiles=[1, 2],
+            message="Fan-out alert",
+            timestamp=datetime.now(),
+            severity="HIGH"
+        )
+
+        mqtt_handler.broadcast_alert(alert)
+        mqtt_handler.send_alert_to_client("client_123", alert)
+
+        calls = mqtt_handler.client_publisher.publish.call_args_list
+        assert len(calls) == 2
+        # Same bytes object published to both destinations
+        assert calls[0][0][1] is calls[1][0][1]
+
+    @pytest.mark.parametrize("num_clients", [1, 3, 50])
+    def test_fan_out_serializes_once(self, mqtt_handler, num_clients):
+        """Test that fan_out publishes the same payload to every target."""
+        alert = Alert(
+            id=3,
+            type=AlertType.MEDICAL,
+            disabled_tiles=[301],
+            message="Medical emergency",
+            timestamp=datetime.now(),
+            severity="HIGH"
+        )
+        client_ids = [f"client_{i}" for i in range(num_clients)]
+
+        mqtt_handler.fan_out(client_ids, alert)
+
+        calls = mqtt_handler.client_publisher.publish.call_args_list
+        assert [c[0][0] for c in calls] == [
+            f"alerts/client/{cid}" for cid in client_ids
+        ]
+        # One serialization shared by all targets
+        first_payload = calls[0][0][1]
+        assert all(c[0][1] is first_payload for c in calls)
+
+    def test_outbox_flushes_queued_alerts(self, mqtt_handler):
+        """Test that queued alerts are published together when flushed."""
+        # Simulate a running drain thread: publishes are queued, not inline
+        mqtt_handler._draining = True
+
+        alert = Alert(
+            id=1,
+            type=AlertType.FIRE,
+            disabled_tiles=[101],
+            message="Queued alert",
+            timestamp=datetime.now(),
+            severity="HIGH"
+        )
+
+        mqtt_handler.broadcast_alert(alert)
+        mqtt_handler.send_alert_to_client("client_1", alert)
+
+        # Nothing published yet - alerts are sitting in the outbox
+        assert not mqtt_handler.client_publisher.publish.called
+        assert len(mqtt_handler._outbox) == 2
+
+        # Flushing publishes everything back to back
+        mqtt_handler._flush_outbox()
+        assert mqtt_handler.client_publisher.publish.call_count == 2
+        assert len(mqtt_handler._outbox) == 0
+
+    def test_on_message_with_callback(self, mqtt_handler):
         """Test processing incoming MQTT message with callback."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
         # Setup mock callback
         mock_callback = Mock()
-        handler.set_message_callback(mock_callback)
-        
+        mqtt_handler.set_message_callback(mock_callback)
+
         # Create mock message
         mock_msg = Mock()
         test_payload = {
@@ -167,23 +367,18 @@ class TestMQTTAlertHandler:
             "metadata": {"description": "Test fire"}
         }
         mock_msg.payload = json.dumps(test_payload).encode()
-        
+
         # Call message handler
-        handler._on_message(None, None, mock_msg)
-        
+        mqtt_handler._on_message(None, None, mock_msg)
+
         # Verify callback was called
         assert mock_callback.called
         event_arg = mock_callback.call_args[0][0]
-        assert isinstance(event_arg, EmergencyEvent)
+        assert isinstance(event_arg, EmergencyEventStruct)
         assert event_arg.event_id == "test-001"
     
-    def test_on_message_without_callback(self, sample_mqtt_config):
+    def test_on_message_without_callback(self, mqtt_handler):
         """Test processing incoming MQTT message without callback."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
-        # Mock the broadcast_alert method
-        handler.broadcast_alert = Mock()
-        
         # Create mock message
         mock_msg = Mock()
         test_payload = {
@@ -194,24 +389,45 @@ class TestMQTTAlertHandler:
             "metadata": {"description": "Security alert"}
         }
         mock_msg.payload = json.dumps(test_payload).encode()
-        
-        # Call message handler
-        handler._on_message(None, None, mock_msg)
-        
-        # Verify broadcast_alert was called
-        assert handler.broadcast_alert.called
+
+        # Call message handler with broadcast_alert mocked out
+        with patch.object(mqtt_handler, 'broadcast_alert') as mock_broadcast:
+            mqtt_handler._on_message(None, None, mock_msg)
+
+            # Verify broadcast_alert was called
+            assert mock_broadcast.called
     
-    def test_on_message_invalid_json(self, sample_mqtt_config, caplog):
+    def test_on_message_loose_types_fall_back_to_pydantic(self, mqtt_handler):
+        """Test that loosely-typed payloads are coerced via pydantic."""
+        mock_callback = Mock()
+        mqtt_handler.set_message_callback(mock_callback)
+
+        mock_msg = Mock()
+        test_payload = {
+            "event_id": "test-003",
+            "event_type": "FIRE",
+            "timestamp": datetime.now().isoformat(),
+            "severity": "HIGH",
+            "level": "2",  # string instead of int: rejected by the struct
+        }
+        mock_msg.payload = json.dumps(test_payload).encode()
+
+        mqtt_handler._on_message(None, None, mock_msg)
+
+        assert mock_callback.called
+        event_arg = mock_callback.call_args[0][0]
+        assert isinstance(event_arg, EmergencyEvent)
+        assert event_arg.level == 2
+
+    def test_on_message_invalid_json(self, mqtt_handler, caplog):
         """Test handling invalid JSON in message."""
-        handler = MQTTAlertHandler(**sample_mqtt_config)
-        
         # Create mock message with invalid JSON
         mock_msg = Mock()
         mock_msg.payload = b"invalid json"
-        
+
         # Call message handler
-        handler._on_message(None, None, mock_msg)
-        
+        mqtt_handler._on_message(None, None, mock_msg)
+
         # Should log error but not crash
         assert "Failed to decode JSON" in caplog.text
     